@@ -2,9 +2,11 @@ import discord
 import os
 import asyncio
 import logging
+import signal
 from discord.ext import commands
 from database import Database
-from config import DEFAULT_PREFIX
+from config import DEFAULT_PREFIX, RESUME_GATEWAY_SESSION, MEMORY_DIAGNOSTICS, MULTI_BOT, MULTI_BOT_PROVIDERS
+from session import GatewaySession, ResumableBot
 from cryptography.fernet import Fernet
 
 BASE_DIR = os.path.join(os.getcwd(), ".sequential")
@@ -115,95 +117,174 @@ def get_api_key(provider: str = "handler") -> str:
     """Retrieve an API key (for Handler, Google, OpenAI, etc.)."""
     return load_secret("apis", provider)
 
+
+def list_providers(category: str = "tokens") -> list:
+    """List the providers that have a saved secret under `.sequential/<category>/encrypted/`."""
+    ensure_dirs()
+    enc_dir = os.path.join(BASE_DIR, category.lower(), "encrypted")
+    providers = []
+    for filename in sorted(os.listdir(enc_dir)):
+        if filename.startswith(".") and filename.endswith(".token"):
+            providers.append(filename[1:-len(".token")])
+    return providers
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger('discord')
 
-intents = discord.Intents.default()
-intents.members = True
-intents.message_content = True
+if MEMORY_DIAGNOSTICS:
+    import memory as bot_memory
+    bot_memory.start_tracing()
 
-bot = commands.Bot(command_prefix=DEFAULT_PREFIX, intents=intents)
 db = Database()
 
-@bot.event
-async def on_ready():
-    logger.info(f"Logged in as {bot.user} (ID: {bot.user.id})")
-    logger.info(f"Connected to {len(bot.guilds)} guild(s)")
-    
-    try:
-        await load_extensions()
-        await sync_commands()
-        logger.info("Bot is ready!")
-        print(f"Logged in as {bot.user}")
-    except Exception as e:
-        logger.error(f"Error during startup: {e}")
 
-async def load_extensions():
+class SequentialBot(ResumableBot):
+    async def setup_hook(self):
+        await super().setup_hook()
+        # Replayed events arrive before RESUMED, so listeners must be registered before connecting
+        if self.resuming:
+            await load_extensions(self)
+
+
+def create_bot(name: str = "discord") -> commands.Bot:
+    """
+    Build a bot for one token provider.
+    Every bot shares the settings file, lock and caches of this process; the
+    'discord' provider keeps the un-prefixed settings so existing data still applies.
+    """
+    intents = discord.Intents.default()
+    intents.members = True
+    intents.message_content = True
+
+    bot = SequentialBot(
+        command_prefix=DEFAULT_PREFIX,
+        intents=intents,
+        gateway_session=GatewaySession(provider=name, enabled=RESUME_GATEWAY_SESSION)
+    )
+    bot.name = name
+    bot.db = db.namespaced(None if name == "discord" else name)
+
+    @bot.event
+    async def on_ready():
+        bot.gateway_session.mark_ready("identify")
+        logger.info(f"Logged in as {bot.user} (ID: {bot.user.id})")
+        logger.info(f"Connected to {len(bot.guilds)} guild(s)")
+        
+        try:
+            # Already loaded when a RESUME attempt was rejected or after a reconnect
+            if not bot.cogs:
+                await load_extensions(bot)
+            await sync_commands(bot)
+            logger.info(f"Bot {name} is ready!")
+            print(f"Logged in as {bot.user}")
+        except Exception as e:
+            logger.error(f"Error during startup: {e}")
+
+    @bot.event
+    async def on_resumed():
+        # Cache and extensions were prepared in setup_hook, see SequentialBot
+        bot.gateway_session.mark_ready("resume")
+
+    @bot.event
+    async def on_command_error(ctx, error):
+        if isinstance(error, commands.CommandNotFound):
+            return
+        elif isinstance(error, commands.MissingPermissions):
+            await ctx.send("❌ You don't have permission to use this command.")
+        elif isinstance(error, commands.MissingRequiredArgument):
+            await ctx.send(f"❌ Missing required argument: {error.param}")
+        else:
+            logger.error(f"Unhandled error: {error}")
+            await ctx.send(f"❌ An error occurred: {str(error)}")
+
+    @bot.event
+    async def on_app_command_error(interaction: discord.Interaction, error):
+        if isinstance(error, discord.app_commands.MissingPermissions):
+            await interaction.response.send_message(
+                "❌ You don't have permission to use this command.",
+                ephemeral=True
+            )
+        else:
+            logger.error(f"Unhandled app command error: {error}")
+            if not interaction.response.is_done():
+                await interaction.response.send_message(
+                    f"❌ An error occurred: {str(error)}",
+                    ephemeral=True
+                )
+
+    return bot
+
+async def load_extensions(bot: commands.Bot):
     try:
         import commands as bot_commands
         import events as bot_events
+        import metrics as bot_metrics
         
-        await bot_commands.setup(bot, db)
-        await bot_events.setup(bot, db)
+        await bot_commands.setup(bot, bot.db)
+        await bot_events.setup(bot, bot.db)
+        await bot_metrics.setup(bot, bot.db)
+        if MEMORY_DIAGNOSTICS:
+            await bot_memory.setup(bot, bot.db)
         
-        logger.info("Successfully loaded all extensions")
+        logger.info(f"Successfully loaded all extensions for {getattr(bot, 'name', 'discord')}")
     except Exception as e:
-        logger.error(f"Failed to load extensions: {e}")
+        logger.error(f"Failed to load extensions for {getattr(bot, 'name', 'discord')}: {e}")
         raise
 
-async def sync_commands():
+async def sync_commands(bot: commands.Bot):
     try:
         synced = await bot.tree.sync()
-        logger.info(f"Synced {len(synced)} command(s)")
+        logger.info(f"Synced {len(synced)} command(s) for {getattr(bot, 'name', 'discord')}")
     except Exception as e:
-        logger.error(f"Failed to sync commands: {e}")
-
-@bot.event
-async def on_command_error(ctx, error):
-    if isinstance(error, commands.CommandNotFound):
-        return
-    elif isinstance(error, commands.MissingPermissions):
-        await ctx.send("❌ You don't have permission to use this command.")
-    elif isinstance(error, commands.MissingRequiredArgument):
-        await ctx.send(f"❌ Missing required argument: {error.param}")
-    else:
-        logger.error(f"Unhandled error: {error}")
-        await ctx.send(f"❌ An error occurred: {str(error)}")
-
-@bot.event
-async def on_app_command_error(interaction: discord.Interaction, error):
-    if isinstance(error, discord.app_commands.MissingPermissions):
-        await interaction.response.send_message(
-            "❌ You don't have permission to use this command.",
-            ephemeral=True
-        )
-    else:
-        logger.error(f"Unhandled app command error: {error}")
-        if not interaction.response.is_done():
-            await interaction.response.send_message(
-                f"❌ An error occurred: {str(error)}",
-                ephemeral=True
-            )
+        logger.error(f"Failed to sync commands for {getattr(bot, 'name', 'discord')}: {e}")
 
-async def main():
+async def run_bot(name: str, token: str):
+    bot = create_bot(name)
     async with bot:
-        token = get_token()
-        if not token:
-            logger.error("No TOKEN found in environment variables!")
-            return
+        bot.gateway_session.attach(bot)
         
         try:
             await bot.start(token)
         except discord.LoginFailure:
-            logger.error("Invalid token provided!")
+            logger.error(f"Invalid token provided for {name}!")
+        except asyncio.CancelledError:
+            # Only a graceful shutdown leaves a session worth resuming
+            await bot.gateway_session.suspend(bot)
+            raise
         except Exception as e:
-            logger.error(f"Failed to start bot: {e}")
+            logger.error(f"Failed to start bot {name}: {e}")
+
+async def main():
+    if MULTI_BOT:
+        providers = MULTI_BOT_PROVIDERS or list_providers("tokens") or ["discord"]
+    else:
+        providers = ["discord"]
+    
+    tokens = {}
+    for provider in providers:
+        try:
+            tokens[provider] = get_token(provider)
+        except RuntimeError as e:
+            logger.error(str(e))
+    
+    if not tokens:
+        logger.error("No TOKEN found in environment variables!")
+        return
+    
+    if RESUME_GATEWAY_SESSION:
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        except NotImplementedError:
+            pass
+    
+    logger.info(f"Starting {len(tokens)} bot(s): {', '.join(tokens)}")
+    await asyncio.gather(*(run_bot(name, token) for name, token in tokens.items()))
 
 if __name__ == "__main__":
     try:
         asyncio.run(main())
-    except KeyboardInterrupt:
+    except (KeyboardInterrupt, asyncio.CancelledError):
         logger.info("Bot shutdown requested")
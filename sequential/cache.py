@@ -0,0 +1,62 @@
+import re
+from typing import Optional, Dict, Tuple
+import discord
+
+PLACEHOLDER_PATTERN = re.compile(r"\{\w+\}")
+
+
+class ChannelCache:
+    """
+    Maps (guild ID, channel name) to a channel ID.
+    Channel IDs are global, so one cache serves every bot hosted in the process.
+    """
+
+    def __init__(self):
+        self._channels: Dict[Tuple[int, str], int] = {}
+
+    def get(self, guild: discord.Guild, name: str) -> Optional[discord.TextChannel]:
+        key = (guild.id, name)
+        channel_id = self._channels.get(key)
+
+        if channel_id is not None:
+            channel = guild.get_channel(channel_id)
+            # Renamed or deleted channels fall through to a fresh lookup
+            if isinstance(channel, discord.TextChannel) and channel.name == name:
+                return channel
+
+        channel = discord.utils.get(guild.text_channels, name=name)
+        if channel:
+            self._channels[key] = channel.id
+        else:
+            self._channels.pop(key, None)
+        return channel
+
+    def clear(self):
+        self._channels.clear()
+
+    def __len__(self) -> int:
+        return len(self._channels)
+
+
+class TemplateCache:
+    """Remembers which placeholders each message template uses so formatting skips the rest."""
+
+    def __init__(self):
+        self._placeholders: Dict[str, Tuple[str, ...]] = {}
+
+    def get(self, template: str) -> Tuple[str, ...]:
+        placeholders = self._placeholders.get(template)
+        if placeholders is None:
+            placeholders = tuple(dict.fromkeys(PLACEHOLDER_PATTERN.findall(template)))
+            self._placeholders[template] = placeholders
+        return placeholders
+
+    def clear(self):
+        self._placeholders.clear()
+
+    def __len__(self) -> int:
+        return len(self._placeholders)
+
+
+channel_cache = ChannelCache()
+template_cache = TemplateCache()
@@ -1,3 +1,39 @@
+import os
+
+
+def _env_flag(name: str, default: str = "false") -> bool:
+    return os.getenv(name, default).lower() in ["true", "yes", "1", "on", "enabled"]
+
+
 DEFAULT_EMBED_COLOR = 0x00ff00
 BOT_VERSION = "2.0"
 DEFAULT_PREFIX = "."
+
+# Persist the gateway session on shutdown and RESUME it on the next start
+RESUME_GATEWAY_SESSION = _env_flag("SEQUENTIAL_RESUME_SESSION")
+# Saved sessions older than this (seconds) are discarded instead of attempting a RESUME
+GATEWAY_SESSION_MAX_AGE = 300
+# Guilds fetched over REST at once when rebuilding the cache before a RESUME
+GATEWAY_HYDRATE_CONCURRENCY = 5
+
+# Opt-in tracemalloc diagnostics, adds the /memory admin command
+MEMORY_DIAGNOSTICS = _env_flag("SEQUENTIAL_MEMORY_DIAGNOSTICS")
+MEMORY_SNAPSHOT_INTERVAL = 300
+# Deep enough to reach a sequential/ frame from most library calls; cost grows with depth
+MEMORY_TRACE_FRAMES = 10
+# Soft budgets in MB per subsystem, shared by every bot in the process. "discord" is per bot
+# and "total" (all traced memory) grows by the "discord" budget for each extra bot
+MEMORY_BUDGETS = {
+    "total": 256,
+    "discord": 192,
+    "embeds": 8,
+    "database": 16,
+    "logging": 8,
+    "cache": 4,
+}
+
+# Start one bot per token saved under .sequential/tokens/ in a single process
+MULTI_BOT = _env_flag("SEQUENTIAL_MULTI_BOT")
+# Optional comma separated allowlist of token providers, e.g. "discord,support"
+MULTI_BOT_PROVIDERS = [name.strip().lower() for name in os.getenv("SEQUENTIAL_BOTS", "").split(",") if name.strip()]
+METRICS_REPORT_INTERVAL = 300
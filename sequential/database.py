@@ -5,11 +5,21 @@ import asyncio
 from threading import Lock
 
 class Database:
-    def __init__(self, filepath: str = "server_settings.json"):
+    def __init__(self, filepath: str = "server_settings.json", namespace: Optional[str] = None, lock: Optional[Lock] = None):
         self.filepath = filepath
-        self.lock = Lock()
+        self.namespace = namespace
+        self.lock = lock or Lock()
         self._ensure_file_exists()
     
+    def namespaced(self, namespace: Optional[str]) -> "Database":
+        """Return a view of the same settings file and lock whose guild keys are prefixed with `namespace`."""
+        return Database(self.filepath, namespace=namespace, lock=self.lock)
+    
+    def _guild_key(self, guild_id: int) -> str:
+        if self.namespace:
+            return f"{self.namespace}:{guild_id}"
+        return str(guild_id)
+    
     def _ensure_file_exists(self):
         if not os.path.exists(self.filepath):
             with open(self.filepath, 'w') as f:
@@ -29,7 +39,7 @@ class Database:
     def get_server_settings(self, guild_id: int) -> Dict[str, Any]:
         with self.lock:
             data = self._read_data()
-            guild_key = str(guild_id)
+            guild_key = self._guild_key(guild_id)
             
             if guild_key not in data:
                 data[guild_key] = self._get_default_settings()
@@ -40,7 +50,7 @@ class Database:
     def update_server_setting(self, guild_id: int, key: str, value: Any):
         with self.lock:
             data = self._read_data()
-            guild_key = str(guild_id)
+            guild_key = self._guild_key(guild_id)
             
             if guild_key not in data:
                 data[guild_key] = self._get_default_settings()
@@ -2,6 +2,7 @@ import discord
 from discord.ext import commands
 from database import Database
 from utils import format_message, create_embed
+from cache import channel_cache
 import logging
 
 logger = logging.getLogger('discord')
@@ -20,7 +21,7 @@ class BotEvents(commands.Cog):
                 return
             
             welcome_channel_name = settings.get("welcome_channel", "welcome")
-            channel = discord.utils.get(member.guild.text_channels, name=welcome_channel_name)
+            channel = channel_cache.get(member.guild, welcome_channel_name)
             
             if not channel:
                 logger.warning(f"Welcome channel '{welcome_channel_name}' not found in {member.guild.name}")
@@ -43,7 +44,7 @@ class BotEvents(commands.Cog):
             embed.set_thumbnail(url=member.display_avatar.url)
             
             rules_channel_name = settings.get("rules_channel", "rules")
-            rules_channel = discord.utils.get(member.guild.text_channels, name=rules_channel_name)
+            rules_channel = channel_cache.get(member.guild, rules_channel_name)
             
             if rules_channel:
                 embed.add_field(
@@ -61,18 +62,24 @@ class BotEvents(commands.Cog):
             logger.error(f"Error sending welcome message: {str(e)}")
     
     @commands.Cog.listener()
-    async def on_member_remove(self, member: discord.Member):
+    async def on_raw_member_remove(self, payload: discord.RawMemberRemoveEvent):
+        # The raw event fires even when the member was never cached, e.g. right after a RESUME
+        guild = self.bot.get_guild(payload.guild_id)
+        if guild is None:
+            return
+        
+        member = payload.user
         try:
-            settings = self.db.get_server_settings(member.guild.id)
+            settings = self.db.get_server_settings(guild.id)
             
             if not settings.get("goodbye_enabled", True):
                 return
             
             welcome_channel_name = settings.get("welcome_channel", "welcome")
-            channel = discord.utils.get(member.guild.text_channels, name=welcome_channel_name)
+            channel = channel_cache.get(guild, welcome_channel_name)
             
             if not channel:
-                logger.warning(f"Goodbye channel '{welcome_channel_name}' not found in {member.guild.name}")
+                logger.warning(f"Goodbye channel '{welcome_channel_name}' not found in {guild.name}")
                 return
             
             goodbye_message = settings.get(
@@ -81,7 +88,7 @@ class BotEvents(commands.Cog):
             )
             embed_color = settings.get("embed_color", 0xff0000)
             
-            formatted_message = format_message(goodbye_message, member, member.guild)
+            formatted_message = format_message(goodbye_message, member, guild)
             
             embed = create_embed(
                 title="👋 Goodbye",
@@ -92,10 +99,10 @@ class BotEvents(commands.Cog):
             embed.set_thumbnail(url=member.display_avatar.url)
             
             await channel.send(embed=embed)
-            logger.info(f"Sent goodbye message for {member.name} in {member.guild.name}")
+            logger.info(f"Sent goodbye message for {member.name} in {guild.name}")
             
         except discord.Forbidden:
-            logger.error(f"Missing permissions to send goodbye message in {member.guild.name}")
+            logger.error(f"Missing permissions to send goodbye message in {guild.name}")
         except Exception as e:
             logger.error(f"Error sending goodbye message: {str(e)}")
 
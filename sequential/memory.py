@@ -0,0 +1,257 @@
+import os
+import gc
+import functools
+import asyncio
+import logging
+import tracemalloc
+from typing import Optional, Dict, List, Callable
+import discord
+from discord import app_commands
+from discord.ext import commands, tasks
+from database import Database
+from cache import channel_cache, template_cache
+from utils import create_embed
+from config import DEFAULT_EMBED_COLOR, MEMORY_SNAPSHOT_INTERVAL, MEMORY_TRACE_FRAMES, MEMORY_BUDGETS
+
+logger = logging.getLogger('discord')
+
+SEQUENTIAL_DIR = os.path.dirname(os.path.abspath(__file__)) + os.sep
+DISCORD_DIR = os.path.dirname(os.path.abspath(discord.__file__)) + os.sep
+LOGGING_DIR = os.path.dirname(os.path.abspath(logging.__file__)) + os.sep
+
+MB = 1024 * 1024
+
+
+def start_tracing():
+    """Start tracemalloc as early as possible so startup allocations are attributed too."""
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(MEMORY_TRACE_FRAMES)
+
+
+# Traces whose innermost frame is one of these are left out, like tracemalloc's own bookkeeping
+IGNORED_FILENAMES = {
+    tracemalloc.__file__,
+    "<frozen importlib._bootstrap>",
+    "<frozen importlib._bootstrap_external>",
+    "<unknown>",
+}
+
+
+def take_snapshot() -> tracemalloc.Snapshot:
+    # No filter_traces(): its fnmatch filters run in Python over every trace,
+    # ignored files are skipped during attribution instead
+    return tracemalloc.take_snapshot()
+
+
+@functools.lru_cache(maxsize=None)
+def get_file_subsystem(filename: str) -> Optional[str]:
+    """Map a source file to its subsystem, or None if it belongs to none we track."""
+    # Pseudo files such as "<frozen abc>" would otherwise resolve under the working directory
+    if filename.startswith("<"):
+        return None
+    filename = os.path.abspath(filename)
+    if filename.startswith(SEQUENTIAL_DIR):
+        return os.path.splitext(os.path.basename(filename))[0]
+    if filename.startswith(DISCORD_DIR):
+        return "embeds" if os.path.basename(filename) == "embeds.py" else "discord"
+    if filename.startswith(LOGGING_DIR):
+        return "logging"
+    return None
+
+
+def get_subsystem(frames: tuple) -> Optional[str]:
+    """
+    Attribute an allocation to the innermost frame we recognise.
+    `frames` is a raw tracemalloc traceback of (filename, lineno) pairs, most recent first.
+    Modules in `sequential/` are reported by name, e.g. 'database' or 'events'.
+    """
+    if not frames or frames[0][0] in IGNORED_FILENAMES:
+        return None
+    for filename, _ in frames:
+        name = get_file_subsystem(filename)
+        if name is not None:
+            return name
+    return "other"
+
+
+def get_subsystem_sizes(snapshot: tracemalloc.Snapshot) -> Dict[str, int]:
+    # Group on the raw frames tuple first (hashed in C, the same data statistics() uses)
+    # so each distinct traceback is attributed once instead of once per trace
+    traceback_sizes: Dict[tuple, int] = {}
+    for _, size, frames, _ in snapshot.traces._traces:
+        traceback_sizes[frames] = traceback_sizes.get(frames, 0) + size
+
+    sizes: Dict[str, int] = {}
+    for frames, size in traceback_sizes.items():
+        name = get_subsystem(frames)
+        if name is not None:
+            sizes[name] = sizes.get(name, 0) + size
+    sizes["total"] = sum(sizes.values())
+    return sizes
+
+
+def format_size(size: int) -> str:
+    if abs(size) >= MB:
+        return f"{size / MB:+.2f} MB"
+    return f"{size / 1024:+.1f} KB"
+
+
+def short_filename(filename: str) -> str:
+    for prefix in (SEQUENTIAL_DIR, os.path.dirname(DISCORD_DIR.rstrip(os.sep)) + os.sep):
+        if filename.startswith(prefix):
+            return filename[len(prefix):]
+    return os.path.basename(filename)
+
+
+class MemoryDiagnostics(commands.Cog):
+    """
+    Tracing is process-wide, so when several bots share a process one cog
+    takes the snapshots and every cog reads and trims shared state. When the
+    owning bot unloads, another loaded cog takes over the snapshot loop.
+    """
+
+    previous: Optional[tracemalloc.Snapshot] = None
+    previous_sizes: Dict[str, int] = {}
+    trimmers: Dict[str, List[Callable[[], None]]] = {}
+    instances: List["MemoryDiagnostics"] = []
+    snapshot_owner: Optional["MemoryDiagnostics"] = None
+
+    def __init__(self, bot: commands.Bot, db: Database):
+        self.bot = bot
+        self.db = db
+
+        self.register_trim("discord", self._trim_message_cache)
+        if not self.trimmers.get("cache"):
+            self.register_trim("cache", channel_cache.clear)
+            self.register_trim("cache", template_cache.clear)
+
+    async def cog_load(self):
+        start_tracing()
+        self.instances.append(self)
+        if MemoryDiagnostics.snapshot_owner is None:
+            MemoryDiagnostics.snapshot_owner = self
+            self.snapshot_loop.start()
+
+    async def cog_unload(self):
+        self.trimmers["discord"].remove(self._trim_message_cache)
+        self.instances.remove(self)
+        if MemoryDiagnostics.snapshot_owner is self:
+            self.snapshot_loop.cancel()
+            MemoryDiagnostics.snapshot_owner = None
+            if self.instances:
+                successor = self.instances[0]
+                MemoryDiagnostics.snapshot_owner = successor
+                successor.snapshot_loop.start()
+                logger.info(f"Memory snapshots handed over to bot {getattr(successor.bot, 'name', 'discord')}")
+
+    def register_trim(self, subsystem: str, callback: Callable[[], None]):
+        """Register a callback that drops cached data when `subsystem` is over budget."""
+        self.trimmers.setdefault(subsystem, []).append(callback)
+
+    def _trim_message_cache(self):
+        messages = self.bot._connection._messages
+        if messages:
+            messages.clear()
+
+    def _capture(self):
+        snapshot = take_snapshot()
+        return snapshot, get_subsystem_sizes(snapshot)
+
+    def _capture_growth(self, previous: tracemalloc.Snapshot):
+        snapshot, sizes = self._capture()
+        growth = [
+            stat for stat in snapshot.compare_to(previous, 'lineno')
+            if stat.traceback[0].filename not in IGNORED_FILENAMES
+        ]
+        return sizes, growth[:10]
+
+    def get_budget(self, name: str) -> float:
+        """
+        Budget in MB. Every hosted bot has its own discord.py caches, so that
+        budget is per bot and "total" grows by the same amount.
+        """
+        limit = MEMORY_BUDGETS[name]
+        extra_bots = max(len(self.instances), 1) - 1
+        if name == "discord":
+            limit *= extra_bots + 1
+        elif name == "total":
+            limit += MEMORY_BUDGETS.get("discord", 0) * extra_bots
+        return limit
+
+    def check_budgets(self, sizes: Dict[str, int]):
+        over_budget = [
+            name for name in MEMORY_BUDGETS
+            if sizes.get(name, 0) > self.get_budget(name) * MB
+        ]
+
+        for name in over_budget:
+            logger.warning(
+                f"Memory budget exceeded for '{name}': "
+                f"{sizes[name] / MB:.2f} MB > {self.get_budget(name)} MB"
+            )
+            callbacks = self.trimmers.get(name, [])
+            if name == "total":
+                callbacks = [cb for cbs in self.trimmers.values() for cb in cbs]
+            for callback in callbacks:
+                try:
+                    callback()
+                except Exception as e:
+                    logger.error(f"Failed to trim '{name}' cache: {e}")
+
+        if over_budget:
+            gc.collect()
+
+    @tasks.loop(seconds=MEMORY_SNAPSHOT_INTERVAL)
+    async def snapshot_loop(self):
+        try:
+            snapshot, sizes = await asyncio.to_thread(self._capture)
+            self.check_budgets(sizes)
+            MemoryDiagnostics.previous, MemoryDiagnostics.previous_sizes = snapshot, sizes
+            logger.info(f"Memory snapshot: {sizes['total'] / MB:.2f} MB traced")
+        except Exception as e:
+            logger.error(f"Failed to take memory snapshot: {e}")
+
+    @app_commands.command(name="memory", description="Show memory growth since the last snapshot")
+    @app_commands.default_permissions(administrator=True)
+    async def memory(self, interaction: discord.Interaction):
+        try:
+            await interaction.response.defer(ephemeral=True)
+
+            if self.previous is None:
+                await interaction.followup.send("No memory snapshot has been taken yet.", ephemeral=True)
+                return
+
+            # compare_to is as slow as the snapshot itself, keep both off the event loop
+            sizes, top_growth = await asyncio.to_thread(self._capture_growth, self.previous)
+
+            embed = create_embed(
+                title="🧠 Memory Diagnostics",
+                description=f"**Traced:** {sizes['total'] / MB:.2f} MB ({format_size(sizes['total'] - self.previous_sizes.get('total', 0))})",
+                color=DEFAULT_EMBED_COLOR
+            )
+
+            subsystems = sorted((name for name in sizes if name != "total"), key=lambda name: -sizes[name])
+            embed.add_field(
+                name="Subsystems",
+                value="\n".join(
+                    f"`{name}` {sizes[name] / MB:.2f} MB ({format_size(sizes[name] - self.previous_sizes.get(name, 0))})"
+                    for name in subsystems
+                )[:1024] or "None",
+                inline=False
+            )
+            embed.add_field(
+                name="Top Growth",
+                value="\n".join(
+                    f"`{short_filename(stat.traceback[0].filename)}:{stat.traceback[0].lineno}` {format_size(stat.size_diff)}"
+                    for stat in top_growth if stat.size_diff > 0
+                )[:1024] or "No growth",
+                inline=False
+            )
+
+            await interaction.followup.send(embed=embed, ephemeral=True)
+        except Exception as e:
+            await interaction.followup.send(f"Error: {str(e)}", ephemeral=True)
+
+
+async def setup(bot: commands.Bot, db: Database):
+    await bot.add_cog(MemoryDiagnostics(bot, db))
@@ -0,0 +1,65 @@
+import logging
+from typing import Dict
+import discord
+from discord import app_commands
+from discord.ext import commands, tasks
+from database import Database
+from config import METRICS_REPORT_INTERVAL
+
+logger = logging.getLogger('discord')
+
+
+class BotMetrics(commands.Cog):
+    """Per-bot counters, logged periodically so bots sharing a process can be told apart."""
+
+    def __init__(self, bot: commands.Bot, db: Database):
+        self.bot = bot
+        self.db = db
+        self.name = getattr(bot, "name", "discord")
+        self.counters: Dict[str, int] = {}
+
+    async def cog_load(self):
+        self.report_loop.start()
+
+    async def cog_unload(self):
+        self.report_loop.cancel()
+
+    def increment(self, key: str, amount: int = 1):
+        self.counters[key] = self.counters.get(key, 0) + amount
+
+    def summary(self) -> str:
+        parts = [
+            f"guilds={len(self.bot.guilds)}",
+            f"latency={self.bot.latency * 1000:.0f}ms",
+        ]
+
+        gateway_session = getattr(self.bot, "gateway_session", None)
+        if gateway_session and gateway_session.time_to_ready is not None:
+            parts.append(f"time_to_ready={gateway_session.time_to_ready:.2f}s ({gateway_session.ready_mode})")
+
+        parts.extend(f"{key}={value}" for key, value in sorted(self.counters.items()))
+        return f"[{self.name}] " + " ".join(parts)
+
+    @tasks.loop(seconds=METRICS_REPORT_INTERVAL)
+    async def report_loop(self):
+        logger.info(f"Metrics {self.summary()}")
+
+    @commands.Cog.listener()
+    async def on_app_command_completion(self, interaction: discord.Interaction, command: app_commands.Command):
+        self.increment("commands")
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        self.increment("member_joins")
+
+    @commands.Cog.listener()
+    async def on_raw_member_remove(self, payload: discord.RawMemberRemoveEvent):
+        self.increment("member_removes")
+
+    @commands.Cog.listener()
+    async def on_resumed(self):
+        self.increment("resumes")
+
+
+async def setup(bot: commands.Bot, db: Database):
+    await bot.add_cog(BotMetrics(bot, db))
@@ -0,0 +1,254 @@
+import json
+import os
+import time
+import asyncio
+import logging
+from typing import Optional, Dict, Any
+import discord
+import aiohttp
+import yarl
+from discord.backoff import ExponentialBackoff
+from discord.ext import commands
+from discord.gateway import DiscordWebSocket, ReconnectWebSocket
+from config import GATEWAY_SESSION_MAX_AGE, GATEWAY_HYDRATE_CONCURRENCY
+
+logger = logging.getLogger('discord')
+
+SESSION_DIR = os.path.join(os.getcwd(), ".sequential", "sessions")
+
+
+class GatewaySession:
+    """
+    Persists the gateway session across process restarts.
+
+    On graceful shutdown the session ID, sequence number and resume URL are
+    written to `.sequential/sessions/<provider>.json`. On the next start the
+    first connection of a `ResumableBot` sends RESUME instead of IDENTIFY and
+    falls back to IDENTIFY if Discord rejects it. Time-to-ready is always
+    reported, whether or not resuming is enabled.
+    """
+
+    def __init__(self, provider: str = "discord", enabled: bool = False, max_age: float = GATEWAY_SESSION_MAX_AGE):
+        self.filepath = os.path.join(SESSION_DIR, f"{provider.lower()}.json")
+        self.enabled = enabled
+        self.max_age = max_age
+        self.attempted = False
+        self.started_at: Optional[float] = None
+        self.time_to_ready: Optional[float] = None
+        self.ready_mode: Optional[str] = None
+        self.hydrate_time: Optional[float] = None
+        self._guild_ids: list = []
+
+    def _read(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.filepath, 'r') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, FileNotFoundError):
+            return None
+
+    def _write(self, data: Dict[str, Any]):
+        os.makedirs(os.path.dirname(self.filepath), exist_ok=True)
+        with open(self.filepath, 'w') as f:
+            json.dump(data, f, indent=2)
+
+    def clear(self):
+        try:
+            os.remove(self.filepath)
+        except FileNotFoundError:
+            pass
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Load and consume the saved session. A session is only ever offered for one RESUME."""
+        data = self._read()
+        self.clear()
+
+        if not data:
+            return None
+
+        if any(data.get(key) is None for key in ("session_id", "sequence", "resume_gateway_url", "saved_at")):
+            logger.warning("Ignoring incomplete saved gateway session")
+            return None
+
+        age = time.time() - data["saved_at"]
+        if age > self.max_age:
+            logger.info(f"Saved gateway session is {age:.0f}s old, performing a fresh IDENTIFY")
+            return None
+
+        return data
+
+    def attach(self, bot: commands.Bot):
+        """Start the time-to-ready clock and, when enabled, queue the saved session for RESUME."""
+        self.started_at = time.perf_counter()
+
+        if not self.enabled:
+            return
+
+        data = self.load()
+        if data:
+            bot.pending_resume = data
+            self._guild_ids = data.get("guild_ids", [])
+            self.attempted = True
+
+    async def suspend(self, bot: commands.Bot):
+        """
+        Save the current session and close the socket without invalidating it.
+        Discord invalidates sessions closed with code 1000, which is what `bot.close()` sends.
+        """
+        if not self.enabled:
+            return
+
+        ws = bot.ws
+        if bot.is_closed() or ws is None or ws.session_id is None or ws.sequence is None:
+            return
+
+        try:
+            self._write({
+                "session_id": ws.session_id,
+                "sequence": ws.sequence,
+                "resume_gateway_url": str(ws.gateway),
+                "guild_ids": [guild.id for guild in bot.guilds] or self._guild_ids,
+                "saved_at": time.time(),
+            })
+            logger.info(f"Saved gateway session {ws.session_id} at sequence {ws.sequence}")
+        except OSError as e:
+            logger.error(f"Failed to save gateway session: {e}")
+            return
+
+        if ws.open:
+            await ws.close(code=4000)
+
+    def mark_ready(self, mode: str):
+        """Report time-to-ready for the first connection of this process."""
+        if self.started_at is None or self.time_to_ready is not None:
+            return
+
+        self.time_to_ready = time.perf_counter() - self.started_at
+        self.ready_mode = mode
+
+        note = ""
+        if self.attempted and mode == "identify":
+            note = " (saved session rejected)"
+        elif self.hydrate_time is not None:
+            note = f" (includes {self.hydrate_time:.2f}s REST hydration)"
+        logger.info(f"Time to ready: {self.time_to_ready:.2f}s via {mode.upper()}{note}")
+
+    async def hydrate(self, bot: commands.Bot):
+        """
+        Rebuild the guild and channel cache over REST before sending RESUME.
+        A resumed session never replays GUILD_CREATE, and Discord replays the
+        missed events before RESUMED, so the cache must exist before connecting.
+        Members are not fetched; see `on_raw_member_remove` in events.py.
+
+        Guilds the bot can no longer access are skipped. Any other failure
+        abandons the RESUME so the bot falls back to IDENTIFY with a full cache.
+        """
+        state = bot._connection
+        started_at = time.perf_counter()
+        semaphore = asyncio.Semaphore(GATEWAY_HYDRATE_CONCURRENCY)
+
+        async def fetch(guild_id: int) -> Optional[discord.Guild]:
+            async with semaphore:
+                try:
+                    guild = await bot.fetch_guild(guild_id)
+                    for channel in await guild.fetch_channels():
+                        guild._add_channel(channel)
+                except (discord.NotFound, discord.Forbidden):
+                    logger.info(f"Skipping guild {guild_id}, it is no longer accessible")
+                    return None
+                guild._member_count = guild.approximate_member_count
+                return guild
+
+        guild_ids = [guild_id for guild_id in self._guild_ids if not bot.get_guild(guild_id)]
+        results = await asyncio.gather(*(fetch(guild_id) for guild_id in guild_ids), return_exceptions=True)
+
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            logger.warning(f"Failed to hydrate {len(errors)} guild(s), falling back to IDENTIFY: {errors[0]!r}")
+            bot.pending_resume = None
+            return
+
+        for guild in results:
+            if guild is not None:
+                state._add_guild(guild)
+
+        self.hydrate_time = time.perf_counter() - started_at
+        logger.info(f"Hydrated {len(bot.guilds)} guild(s) over REST in {self.hydrate_time:.2f}s")
+
+
+class ResumableBot(commands.Bot):
+    """
+    A bot whose first gateway connection can RESUME a session saved by a previous process.
+    Nothing changes unless `GatewaySession.attach` queued a session in `pending_resume`.
+    """
+
+    def __init__(self, *args, gateway_session: GatewaySession, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.gateway_session = gateway_session
+        self.pending_resume: Optional[Dict[str, Any]] = None
+
+    @property
+    def resuming(self) -> bool:
+        return self.pending_resume is not None
+
+    async def setup_hook(self):
+        # Runs inside login(), before connect(), so replayed events find the cache
+        if self.resuming:
+            await self.gateway_session.hydrate(self)
+
+    async def connect(self, *, reconnect: bool = True) -> None:
+        """
+        Mirror of `Client.connect` for a session saved by a previous process.
+        Transient failures back off and RESUME again; only INVALID_SESSION or a
+        fatal close code falls back to `Client.connect`, which sends IDENTIFY.
+        """
+        pending = self.pending_resume
+        self.pending_resume = None
+        if not pending:
+            return await super().connect(reconnect=reconnect)
+
+        backoff = ExponentialBackoff()
+        params = {
+            "session": pending["session_id"],
+            "sequence": pending["sequence"],
+            "gateway": yarl.URL(pending["resume_gateway_url"]),
+        }
+        logger.info(f"Attempting to RESUME gateway session {pending['session_id']}")
+
+        while not self.is_closed():
+            try:
+                coro = DiscordWebSocket.from_client(self, initial=True, shard_id=self.shard_id, resume=True, **params)
+                self.ws = await asyncio.wait_for(coro, timeout=60.0)
+                while True:
+                    await self.ws.poll_event()
+            except ReconnectWebSocket as e:
+                self.dispatch('disconnect')
+                if not e.resume:
+                    logger.info("Gateway session was invalidated, falling back to IDENTIFY")
+                    break
+                if self.ws is not None:
+                    params.update(session=self.ws.session_id, sequence=self.ws.sequence, gateway=self.ws.gateway)
+            except (OSError, discord.HTTPException, discord.GatewayNotFound, discord.ConnectionClosed, aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                self.dispatch('disconnect')
+                if self.is_closed():
+                    return
+
+                if not reconnect:
+                    await self.close()
+                    if isinstance(exc, discord.ConnectionClosed) and exc.code == 1000:
+                        return
+                    raise
+
+                # Close codes discord.py cannot RESUME from; Client.connect reports them properly
+                if isinstance(exc, discord.ConnectionClosed) and exc.code != 1000:
+                    logger.warning(f"Gateway closed with code {exc.code}, falling back to IDENTIFY")
+                    break
+
+                retry = backoff.delay()
+                logger.warning(f"Gateway connection lost, attempting to RESUME again in {retry:.2f}s")
+                await asyncio.sleep(retry)
+                if self.ws is not None:
+                    params.update(session=self.ws.session_id, sequence=self.ws.sequence, gateway=self.ws.gateway)
+        else:
+            return
+
+        await super().connect(reconnect=reconnect)
@@ -1,7 +1,9 @@
 import discord
 from datetime import datetime
+from typing import Union
+from cache import template_cache
 
-def format_message(template: str, member: discord.Member, guild: discord.Guild) -> str:
+def format_message(template: str, member: Union[discord.Member, discord.User], guild: discord.Guild) -> str:
     replacements = {
         "{mention}": member.mention,
         "{username}": member.name,
@@ -12,8 +14,9 @@ def format_message(template: str, member: discord.Member, guild: discord.Guild)
     }
     
     message = template
-    for key, value in replacements.items():
-        message = message.replace(key, value)
+    for key in template_cache.get(template):
+        if key in replacements:
+            message = message.replace(key, replacements[key])
     
     return message
 